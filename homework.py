@@ -1,9 +1,12 @@
 import logging
 import os
+import random
 import sys
 import time
+from collections import OrderedDict
 from contextlib import suppress
 from http import HTTPStatus
+from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
@@ -19,6 +22,14 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
+MAX_PERIOD = 3600
+IDLE_PERIOD_FACTOR = 1.5
+FAIL_BACKOFF_BASE = 30
+FAIL_BACKOFF_JITTER = 5
+API_TIMEOUT = (5, 30)
+SENT_CACHE_MAX = 64
+SENT_CACHE_TTL = 3600
+TIMESTAMP_FILE = Path(os.getenv('TIMESTAMP_FILE', '.hw_ts'))
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
@@ -28,6 +39,10 @@ HOMEWORK_VERDICTS = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
+SENT_MESSAGES = OrderedDict()
+
+logger = logging.getLogger(__name__)
+
 
 def check_tokens():
     """Проверяет наличие всех необходимых переменных окружения."""
@@ -42,38 +57,70 @@ def check_tokens():
         error_message = (
             f"Отсутствуют обязательные переменные окружения: {missing}"
         )
-        logging.critical(error_message)
+        logger.critical(error_message)
         raise EnvironmentError(error_message)
 
 
 def send_message(bot, message):
     """Отправляет сообщение в Telegram."""
-    logging.debug(f'Начало отправки сообщения: "{message}"')
+    logger.debug('Начало отправки сообщения: "%s"', message)
     bot.send_message(TELEGRAM_CHAT_ID, message)
-    logging.debug(f'Бот отправил сообщение: "{message}"')
+    logger.info('Бот отправил сообщение: "%s"', message)
+
+
+def is_message_sent(key):
+    """Проверяет, отправлялось ли сообщение с ключом за SENT_CACHE_TTL."""
+    now = time.monotonic()
+    while SENT_MESSAGES:
+        oldest_key, sent_at = next(iter(SENT_MESSAGES.items()))
+        if now - sent_at <= SENT_CACHE_TTL:
+            break
+        del SENT_MESSAGES[oldest_key]
+    return key in SENT_MESSAGES
+
+
+def remember_message(key):
+    """Запоминает ключ отправленного сообщения (не больше SENT_CACHE_MAX)."""
+    SENT_MESSAGES[key] = time.monotonic()
+    SENT_MESSAGES.move_to_end(key)
+    if len(SENT_MESSAGES) > SENT_CACHE_MAX:
+        SENT_MESSAGES.popitem(last=False)
+
+
+def notify_error(bot, error_message):
+    """Сообщает об ошибке в Telegram, если о ней ещё не сообщали."""
+    if not is_message_sent(error_message):
+        with suppress(Exception):
+            send_message(bot, error_message)
+        remember_message(error_message)
 
 
 def get_api_answer(timestamp):
     """Делает запрос к API."""
-    logging.debug(f'Начало отправки запроса к API. URL: {ENDPOINT},'
-                  f'параметры: {{"from_date": {timestamp}}}')
+    params = {'from_date': timestamp}
+    logger.debug(
+        'Начало отправки запроса к API. URL: %s, параметры: %s',
+        ENDPOINT, params
+    )
 
     try:
         response = requests.get(
-            ENDPOINT, headers=HEADERS, params={'from_date': timestamp}
+            ENDPOINT, headers=HEADERS, params=params,
+            timeout=API_TIMEOUT
+        )
+        logger.debug(
+            'Ответ получен от API. Код состояния: %s', response.status_code
         )
-        logging.debug(f'Ответ получен от API.'
-                      f'Код состояния: {response.status_code}')
     except requests.RequestException as error:
         raise APIRequestError(
             f'Сбой при запросе к API. Эндпоинт: {ENDPOINT}, '
-            f'параметры: {{"from_date": {timestamp}}}. Ошибка: {error}'
+            f'параметры: {params}. Ошибка: {error}'
         )
 
     if response.status_code != HTTPStatus.OK:
         raise APIRequestError(
             f'Эндпоинт недоступен. Код ответа: {response.status_code}. '
-            f'URL: {ENDPOINT}, параметры: {{"from_date": {timestamp}}}'
+            f'URL: {ENDPOINT}, параметры: {params}'
         )
 
     try:
@@ -81,13 +128,13 @@ def get_api_answer(timestamp):
     except ValueError as error:
         raise ValueError(
             f'Ошибка преобразования ответа в JSON. Эндпоинт: {ENDPOINT}, '
-            f'параметры: {{"from_date": {timestamp}}}, ошибка: {error}'
+            f'параметры: {params}, ошибка: {error}'
         )
 
 
 def check_response(response):
     """Проверяет ответ API на корректность."""
-    logging.debug('Начало проверки ответа API')
+    logger.debug('Начало проверки ответа API')
     if not isinstance(response, dict):
         raise TypeError(
             f'Ответ API не является словарём,'
@@ -102,73 +149,148 @@ def check_response(response):
             f'Тип данных "homeworks" не является списком,'
             f'получен тип: {type(response["homeworks"]).__name__}'
         )
-    logging.debug('Проверка ответа завершена успешно')
+    logger.debug('Проверка ответа завершена успешно')
     return response['homeworks']
 
 
 def parse_status(homework):
     """Извлекает статус работы."""
-    logging.debug('Начало извлечения статуса работы')
-    missing_keys = [key for key in ('homework_name', 'status')
-                    if key not in homework]
-    if missing_keys:
+    logger.debug('Начало извлечения статуса работы')
+    try:
+        homework_name = homework['homework_name']
+        status = homework['status']
+    except KeyError as error:
         raise KeyError(
-            f'Отсутствуют ключи в ответе API: {", ".join(missing_keys)}'
-        )
-    homework_name = homework['homework_name']
-    status = homework['status']
-    if status not in HOMEWORK_VERDICTS:
+            f'Отсутствует ключ в ответе API: {error.args[0]}'
+        ) from error
+    verdict = HOMEWORK_VERDICTS.get(status)
+    if verdict is None:
         raise ValueError(f'Неизвестный статус работы: {status}')
-    verdict = HOMEWORK_VERDICTS[status]
-    logging.debug('Статус работы извлечён успешно')
+    logger.debug('Статус работы извлечён успешно')
     return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
+def send_statuses(bot, homeworks):
+    """Отправляет статусы всех работ из ответа API.
+
+    Работы с некорректными данными пропускаются с сообщением об ошибке.
+    Возвращает False, если хотя бы один статус не удалось отправить.
+    """
+    all_sent = True
+    for homework in homeworks:
+        try:
+            message = parse_status(homework)
+        except (KeyError, ValueError) as error:
+            error_message = f'Некорректная работа в ответе API: {error}'
+            logger.error(error_message)
+            notify_error(bot, error_message)
+            continue
+        # Повторная отправка на проверку меняет date_updated,
+        # поэтому новый статус не спутать с уже отправленным.
+        status_key = (
+            homework['homework_name'],
+            homework['status'],
+            homework.get('date_updated')
+        )
+        if is_message_sent(status_key):
+            continue
+        try:
+            send_message(bot, message)
+        except Exception as error:
+            logger.error('Не удалось отправить статус работы: %s', error)
+            all_sent = False
+            continue
+        remember_message(status_key)
+    return all_sent
+
+
+def load_timestamp():
+    """Возвращает сохранённую метку времени или текущее время."""
+    try:
+        return int(TIMESTAMP_FILE.read_text())
+    except (OSError, ValueError):
+        return int(time.time())
+
+
+def save_timestamp(timestamp):
+    """Атомарно сохраняет метку времени последнего ответа API."""
+    tmp_file = TIMESTAMP_FILE.with_name(f'{TIMESTAMP_FILE.name}.tmp')
+    try:
+        tmp_file.write_text(str(timestamp))
+        os.replace(tmp_file, TIMESTAMP_FILE)
+    except OSError as error:
+        logger.error(
+            'Не удалось сохранить метку времени в %s: %s',
+            TIMESTAMP_FILE, error
+        )
+
+
+def get_backoff_period(fails):
+    """Возвращает паузу перед повторным запросом после сбоев API."""
+    backoff = FAIL_BACKOFF_BASE * 2 ** min(fails, 10)
+    return min(
+        RETRY_PERIOD, backoff + random.uniform(0, FAIL_BACKOFF_JITTER)
+    )
+
+
 def main():
     """Основная логика работы бота."""
     check_tokens()
 
     bot = TeleBot(token=TELEGRAM_TOKEN)
-    timestamp = int(time.time())
-    last_message = ""
+    timestamp = load_timestamp()
+    logger.info('Бот запущен, метка времени для опроса API: %s', timestamp)
+    idle_period = RETRY_PERIOD
+    api_fails = 0
 
     while True:
+        sleep_for = RETRY_PERIOD
         try:
             response = get_api_answer(timestamp)
+            api_fails = 0
             homeworks = check_response(response)
 
             if not homeworks:
-                logging.debug('Отсутствуют новые статусы в ответе API')
-                time.sleep(RETRY_PERIOD)
+                logger.debug('Отсутствуют новые статусы в ответе API')
+                # Пока статусы не меняются, опрашиваем API всё реже.
+                sleep_for = idle_period
+                idle_period = min(
+                    MAX_PERIOD, int(idle_period * IDLE_PERIOD_FACTOR)
+                )
                 continue
 
-            # Обработка первого элемента списка homeworks
-            homework = homeworks[0]
-            message = parse_status(homework)
-
-            if message != last_message:
-                send_message(bot, message)
-                last_message = message
+            idle_period = RETRY_PERIOD
 
-            timestamp = response.get('current_date', timestamp)
+            if send_statuses(bot, homeworks):
+                timestamp = response.get('current_date', timestamp)
+                save_timestamp(timestamp)
         except (ApiTelegramException, requests.RequestException) as tg_error:
             error_message = f'Ошибка Telegram API или сети: {tg_error}'
-            logging.error(error_message)
+            logger.error(error_message)
         except Exception as error:
             error_message = f'Сбой в работе программы: {error}'
-            logging.error(error_message)
-            if last_message != error_message:
-                with suppress(Exception):
-                    send_message(bot, error_message)
-                last_message = error_message
+            logger.error(error_message)
+            if isinstance(error, APIRequestError):
+                # Сбои сети обычно кратковременны: повторяем запрос раньше,
+                # но сообщаем только о первом сбое в серии.
+                sleep_for = get_backoff_period(api_fails)
+                api_fails += 1
+                if api_fails > 1:
+                    continue
+            notify_error(bot, error_message)
         finally:
-            time.sleep(RETRY_PERIOD)
+            time.sleep(sleep_for)
 
 
 if __name__ == '__main__':
     logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s, %(levelname)s, %(message)s',
+        level=(
+            logging.DEBUG
+            if os.getenv('HW_BOT_DEBUG', '').lower() in ('1', 'true', 'yes')
+            else logging.INFO
+        ),
+        format='%(asctime)s %(levelname)s %(message)s',
+        datefmt='%H:%M:%S',
         handlers=[logging.StreamHandler(sys.stdout)]
     )
     main()
@@ -1,6 +1,8 @@
 import os
 import sys
+from collections import OrderedDict
 
+import pytest
 import pytest_timeout
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,3 +55,21 @@ pytest_timeout.write = write_timeout_reasons
 os.environ['PRACTICUM_TOKEN'] = 'sometoken'
 os.environ['TELEGRAM_TOKEN'] = '1234:abcdefg'
 os.environ['TELEGRAM_CHAT_ID'] = '12345'
+
+
+@pytest.fixture(autouse=True)
+def timestamp_file(tmp_path, monkeypatch):
+    """Keep the bot state file out of the working directory in tests."""
+    import homework
+    path = tmp_path / '.hw_ts'
+    monkeypatch.setattr(homework, 'TIMESTAMP_FILE', path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def sent_messages(monkeypatch):
+    """Start every test with an empty cache of sent messages."""
+    import homework
+    cache = OrderedDict()
+    monkeypatch.setattr(homework, 'SENT_MESSAGES', cache)
+    return cache
@@ -825,3 +825,209 @@ class TestHomework:
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             check_utils.check_docstring(homework_module, func)
+
+    def test_timestamp_round_trip(self, homework_module, timestamp_file):
+        homework_module.save_timestamp(1700000000)
+        assert timestamp_file.read_text() == '1700000000'
+        assert homework_module.load_timestamp() == 1700000000, (
+            'Убедитесь, что сохранённая метка времени читается при запуске.'
+        )
+
+    @pytest.mark.parametrize('content', (None, 'garbage'))
+    def test_timestamp_fallback(
+            self, homework_module, timestamp_file, content
+    ):
+        if content is not None:
+            timestamp_file.write_text(content)
+        before = int(time.time())
+        assert before <= homework_module.load_timestamp() <= time.time(), (
+            'Убедитесь, что без корректного файла используется текущее время.'
+        )
+
+    def test_timestamp_save_error_is_logged(
+            self, monkeypatch, caplog, homework_module, timestamp_file
+    ):
+        def failing_replace(*args, **kwargs):
+            raise OSError('read-only file system')
+
+        monkeypatch.setattr(homework_module.os, 'replace', failing_replace)
+        with check_utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что ошибка сохранения метки времени логируется '
+                'с уровнем `ERROR`.'
+        )):
+            homework_module.save_timestamp(1700000000)
+        assert not timestamp_file.exists()
+
+    def run_main(self, monkeypatch, homework_module, mock_get, iterations=1):
+        """
+        Run main() for the given number of loop iterations and return the
+        sent messages and the requested pauses.
+        """
+        sent_messages, pauses = [], []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+
+        def mock_sleep(secs):
+            pauses.append(secs)
+            if len(pauses) >= iterations:
+                raise check_utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(
+            homework_module, 'TeleBot', check_utils.MockTelegramBot
+        )
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        with pytest.raises(check_utils.BreakInfiniteLoop):
+            homework_module.main()
+        return sent_messages, pauses
+
+    def test_sent_cache_evicts_by_ttl(self, monkeypatch, homework_module):
+        now = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+        homework_module.remember_message('old')
+        now[0] += homework_module.SENT_CACHE_TTL / 2
+        homework_module.remember_message('new')
+        assert homework_module.is_message_sent('old')
+
+        now[0] += homework_module.SENT_CACHE_TTL / 2 + 1
+        assert not homework_module.is_message_sent('old'), (
+            'Убедитесь, что устаревшие сообщения удаляются из кэша.'
+        )
+        assert homework_module.is_message_sent('new')
+
+    def test_sent_cache_evicts_by_size(self, monkeypatch, homework_module):
+        cache_max = homework_module.SENT_CACHE_MAX
+        for number in range(cache_max + 1):
+            homework_module.remember_message(number)
+
+        assert len(homework_module.SENT_MESSAGES) == cache_max
+        assert not homework_module.is_message_sent(0), (
+            'Убедитесь, что при переполнении кэша удаляется самая старая '
+            'запись.'
+        )
+        assert homework_module.is_message_sent(cache_max)
+
+    def test_main_skips_already_sent_status(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        homework = {
+            'homework_name': 'hw.zip',
+            'status': 'reviewing',
+            'date_updated': '2021-04-11T10:31:09Z'
+        }
+        resubmitted = dict(homework, date_updated='2021-04-11T11:00:00Z')
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data={
+                'homeworks': [homework, dict(homework), resubmitted],
+                'current_date': random_timestamp
+            }
+        )
+
+        sent_messages, _ = self.run_main(
+            monkeypatch, homework_module, mock_get
+        )
+        assert len(sent_messages) == 2, (
+            'Убедитесь, что уже отправленный статус не отправляется повторно, '
+            'а статус повторно отправленной на проверку работы отправляется.'
+        )
+
+    def test_backoff_period_sequence(self, monkeypatch, homework_module):
+        monkeypatch.setattr(
+            homework_module.random, 'uniform', lambda low, high: 0
+        )
+        periods = [homework_module.get_backoff_period(fails)
+                   for fails in range(6)]
+        assert periods == [30, 60, 120, 240, 480, self.RETRY_PERIOD], (
+            'Убедитесь, что пауза после сбоев API растёт вдвое и не '
+            'превышает `RETRY_PERIOD`.'
+        )
+
+    def test_main_alerts_once_per_api_outage(
+            self, monkeypatch, homework_module
+    ):
+        monkeypatch.setattr(
+            homework_module.random, 'uniform', lambda low, high: 0
+        )
+        attempts = []
+
+        def mock_request_get_with_exception(*args, **kwargs):
+            attempts.append(None)
+            raise requests.ConnectionError(
+                f'Connection object at 0x{len(attempts):x} failed'
+            )
+
+        sent_messages, pauses = self.run_main(
+            monkeypatch, homework_module, mock_request_get_with_exception,
+            iterations=4
+        )
+        assert pauses == [30, 60, 120, 240], (
+            'Убедитесь, что после сбоев API бот повторяет запрос с '
+            'нарастающей паузой.'
+        )
+        assert len(sent_messages) == 1, (
+            'Убедитесь, что о серии сбоев API бот сообщает только один раз.'
+        )
+
+    def test_main_processes_mixed_batch(
+            self, monkeypatch, random_timestamp, homework_module,
+            timestamp_file
+    ):
+        homeworks = [
+            {'homework_name': 'a', 'status': 'approved'},
+            {'homework_name': 'b', 'status': 'weird'},
+            {'homework_name': 'c', 'status': 'approved'},
+        ]
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data={'homeworks': homeworks, 'current_date': random_timestamp}
+        )
+
+        sent_messages, _ = self.run_main(
+            monkeypatch, homework_module, mock_get, iterations=2
+        )
+        assert len(sent_messages) == 3, (
+            'Убедитесь, что бот отправляет статусы всех корректных работ, '
+            'один раз сообщает о некорректной и не повторяет сообщения.'
+        )
+        assert '"a"' in sent_messages[0] and '"c"' in sent_messages[2]
+        assert 'weird' in sent_messages[1]
+        assert timestamp_file.read_text() == str(random_timestamp), (
+            'Убедитесь, что метка времени сохраняется после обработки '
+            'всех работ из ответа API.'
+        )
+
+    def test_main_idle_period_grows_and_resets(
+            self, monkeypatch, random_timestamp, homework_module,
+            data_with_new_hw_status
+    ):
+        responses = [None] * 7 + [data_with_new_hw_status, None]
+        attempts = []
+
+        def mock_get(*args, **kwargs):
+            data = responses[len(attempts)]
+            attempts.append(None)
+            return check_utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp, data=data, **kwargs
+            )
+
+        _, pauses = self.run_main(
+            monkeypatch, homework_module, mock_get,
+            iterations=len(responses)
+        )
+        assert len(pauses) == len(attempts), (
+            'Убедитесь, что после каждого запроса к API бот засыпает '
+            'ровно один раз.'
+        )
+        assert pauses == [
+            600, 900, 1350, 2025, 3037, 3600, 3600, 600, 600
+        ], (
+            'Убедитесь, что при пустых ответах пауза растёт до '
+            '`MAX_PERIOD`, а после нового статуса возвращается к '
+            '`RETRY_PERIOD`.'
+        )